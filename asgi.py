@@ -0,0 +1,221 @@
+from asgiref.wsgi import WsgiToAsgi
+from cache import RedisBackend
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from urllib.parse import parse_qsl
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map, Rule
+import asyncio
+import ids
+import serializers
+import time
+
+from app import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    POOL_OPTIONS,
+    STATEMENT_TIMEOUT,
+    Author,
+    Book,
+    Genre,
+    app,
+    http_request_seconds,
+    http_requests,
+    response_cache,
+)
+
+# Production entry point: uvicorn asgi:application --workers N
+# The public catalog reads run natively on asyncio with the asyncpg driver, so
+# one worker keeps many slow or idle clients in flight without a thread each.
+# Every other route is handed to the Flask app through WsgiToAsgi.
+url = make_url(app.config["SQLALCHEMY_DATABASE_URI"]).set(
+    drivername="postgresql+asyncpg"
+)
+# a second pool next to the Flask app's: count both when sizing against
+# max_connections
+engine = create_async_engine(
+    url,
+    **POOL_OPTIONS,
+    connect_args={"server_settings": {"statement_timeout": str(STATEMENT_TIMEOUT)}},
+)
+Session = async_sessionmaker(engine, expire_on_commit=False)
+flask_app = WsgiToAsgi(app)
+
+
+async def paginate(session, query, id_column, args):
+    # like request.args.get(type=int): an invalid limit reads as a missing one
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    try:
+        after = ids.parse(args["after"], id_column.table.name)
+    except (KeyError, ValueError):
+        after = None
+    if after is not None:
+        query = query.where(id_column > after)
+    rows = (await session.scalars(query.order_by(id_column).limit(limit + 1))).all()
+    next_after = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_after = rows[-1].id
+    return rows, next_after
+
+
+# Routes
+# same responses as the Flask views of the same name
+async def get_books(session, args):
+    books, next_after = await paginate(
+        session, select(Book).where(Book.is_show == True), Book.id, args
+    )
+    return 200, {"books": serializers.book_summary.many(books), "next": next_after}
+
+
+async def book_details(session, args, id):
+    book = await session.get(
+        Book, id, options=[selectinload(Book.authors), selectinload(Book.genres)]
+    )
+    if not book:
+        return 404, {"message": "Book not found"}
+    return 200, {"book": serializers.book_details(book)}
+
+
+async def get_genres(session, args):
+    genres, next_after = await paginate(
+        session, select(Genre).where(Genre.is_show == True), Genre.id, args
+    )
+    result = serializers.genre_summary.many(genres)
+    return 200, {"Genres": result, "next": next_after}
+
+
+async def genre_details(session, args, id):
+    genre = await session.get(Genre, id, options=[selectinload(Genre.books)])
+    if not genre:
+        return 404, {"message": "Genre not found"}
+    return 200, {"genre": genre.name, "books": [book.title for book in genre.books]}
+
+
+async def get_authors(session, args):
+    authors, next_after = await paginate(
+        session, select(Author).where(Author.is_show == True), Author.id, args
+    )
+    result = serializers.author_summary.many(authors)
+    return 200, {"Authors": result, "next": next_after}
+
+
+async def author_details(session, args, id):
+    author = await session.get(Author, id, options=[selectinload(Author.books)])
+    if not author:
+        return 404, {"message": "Author not found"}
+    details = {
+        "name": author.name,
+        "birth_year": author.birth_year,
+        "books": [book.title for book in author.books],
+    }
+    return 200, {"author details": details}
+
+
+# (Flask rule, view, cache tag) — rules and tags match the Flask views in app.py
+ROUTES = [
+    ("/books", get_books, "books"),
+    ("/book/<id(book):id>", book_details, "book:{id}"),
+    ("/genres", get_genres, "genres"),
+    ("/genre/<id(genre):id>", genre_details, "genre:{id}"),
+    ("/authors", get_authors, "authors"),
+    ("/author/<id(author):id>", author_details, "author:{id}"),
+]
+# matched with the Flask app's converters, so ids reach the views as integers
+urls = Map(
+    [Rule(rule, endpoint=n, methods=["GET"]) for n, (rule, *_) in enumerate(ROUTES)],
+    converters=app.url_map.converters,
+).bind("localhost")
+
+
+# with RESPONSE_CACHE_URL set, every cache lookup is a blocking Redis round trip
+# or two; they run in the default thread pool so the event loop keeps serving
+# the other clients. The local backend only touches memory and runs inline.
+if isinstance(response_cache.backend, RedisBackend):
+
+    async def off_loop(function, *args):
+        return await asyncio.to_thread(function, *args)
+
+else:
+
+    async def off_loop(function, *args):
+        return function(*args)
+
+
+# the key of a response (it reads the tag generation) and its cached entry
+def cache_lookup(tag, path):
+    key = response_cache.key([tag], path)
+    return key, response_cache.get(key)
+
+
+async def send_body(send, status, body, headers=()):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), *headers],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+# returns the status code sent
+async def serve(scope, send, view, tag, kwargs):
+    pairs = parse_qsl(scope["query_string"].decode(), keep_blank_values=True)
+    args = dict(pairs)
+    path = scope["path"] + "?" + "&".join(f"{k}={v}" for k, v in sorted(pairs))
+
+    # the response cache is shared with the Flask views and their invalidations
+    key, entry = await off_loop(cache_lookup, tag.format(**kwargs), path)
+    if entry is None:
+        async with Session() as session:
+            status, data = await view(session, args, **kwargs)
+        # byte-for-byte the body the Flask view would produce
+        body = app.json.response(data).get_data()
+        if status != 200:
+            await send_body(send, status, body)
+            return status
+        entry = await off_loop(response_cache.set, key, body)
+
+    etag, body = entry
+    quoted = f'"{etag}"'.encode()
+    headers = dict(scope["headers"])
+    if quoted in headers.get(b"if-none-match", b"").split(b", "):
+        await send_body(send, 304, b"", [(b"etag", quoted)])
+        return 304
+    await send_body(send, 200, body, [(b"etag", quoted)])
+    return 200
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] == "http" and scope["method"] == "GET":
+        try:
+            n, kwargs = urls.match(scope["path"], "GET")
+        except HTTPException:
+            # not a catalog read, or a redirect Flask should answer
+            n = None
+        if n is not None:
+            rule, view, tag = ROUTES[n]
+            start = time.perf_counter()
+            status = await serve(scope, send, view, tag, kwargs)
+            http_requests.inc("GET", rule, str(status))
+            http_request_seconds.observe(time.perf_counter() - start, "GET", rule)
+            return
+
+    await flask_app(scope, receive, send)
@@ -0,0 +1,230 @@
+from sqlalchemy import insert, select, text
+from threading import Barrier, Event, Thread
+import argparse
+import base64
+import os
+import random
+import sys
+import time
+
+# Concurrency check of the borrow approvals. Every round adds a book with K
+# copies (--copies, or drawn from 1 to --requests) and --requests pending
+# borrows of it, then --threads clients approve them all at once, through one of:
+#
+#   single  PUT /borrow/approve/<id>, every id sent twice
+#   batch   PUT /borrow/approve with overlapping id lists, every id in two
+#   mixed   both
+#
+# A round passes when exactly K borrows were approved, none twice, the
+# database agrees with the responses, no request failed with a 5xx, and
+# copies_available stayed between 0 and copies_total the whole time (sampled
+# from another connection while the round runs). Runs against any database
+# migrated to head, the same DATABASE_URL as the other bench tools, and only
+# adds rows of its own; exits with status 1 when a round fails:
+#
+#   python bench/approvals.py --rounds 20 --threads 16
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import Book, Borrow, User, allocate_ids, app, db, hash_password, new_id
+
+MODES = ["single", "batch", "mixed"]
+BATCH_SIZE = 10
+
+
+def create_admin(tag):
+    email = f"approvals-{tag}@bench.local"
+    user = User(
+        id=new_id("user_id_seq"),
+        name=f"approvals admin {tag}",
+        email=email,
+        password=hash_password("admin"),
+        password_hashed=True,
+        type="admin",
+        is_show=True,
+    )
+    db.session.add(user)
+    db.session.commit()
+    basic = base64.b64encode(f"{email}:admin".encode()).decode()
+    response = app.test_client().post(
+        "/token", headers={"Authorization": f"Basic {basic}"}
+    )
+    token = response.get_json()["token"]
+    return {"Authorization": f"Bearer {token}"}, (user.id, user.name)
+
+
+# a book with `copies` copies and `requests` pending borrows of it, all made by
+# the bench admin
+def create_round(tag, user, copies, requests):
+    book_id = new_id("book_id_seq")
+    title = f"approvals bench {tag} {book_id}"
+    db.session.add(
+        Book(
+            id=book_id,
+            title=title,
+            pages=1,
+            copies_total=copies,
+            copies_available=copies,
+            is_show=True,
+        )
+    )
+    borrow_ids = allocate_ids("borrow_id_seq", requests)
+    db.session.execute(
+        insert(Borrow),
+        [
+            {
+                "id": b_id,
+                "book_id": book_id,
+                "user_id": user[0],
+                "book_title": title,
+                "member_name": user[1],
+                "status": "requested",
+                "is_show": True,
+            }
+            for b_id in borrow_ids
+        ],
+    )
+    db.session.commit()
+    return book_id, borrow_ids
+
+
+# (method, path, json) of every request the clients of a round send, in the
+# order they are dealt out to the clients: the two approvals of an id are next
+# to each other, so two clients send them at the same moment
+def plan_requests(mode, borrow_ids, rng):
+    groups = []
+    if mode in ("single", "mixed"):
+        groups += [
+            [("PUT", f"/borrow/approve/{b_id}", None)] * 2 for b_id in borrow_ids
+        ]
+    if mode in ("batch", "mixed"):
+        # every id is in two batches, cut from two different shuffles
+        for _ in range(2):
+            shuffled = rng.sample(borrow_ids, len(borrow_ids))
+            for start in range(0, len(shuffled), BATCH_SIZE):
+                batch = shuffled[start : start + BATCH_SIZE]
+                groups.append([("PUT", "/borrow/approve", {"ids": batch})])
+    rng.shuffle(groups)
+    return [call for group in groups for call in group]
+
+
+# samples copies_available until `stop` is set, collecting values out of range
+def watch_copies(engine, book_id, stop, out_of_range):
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        while not stop.is_set():
+            available, total = conn.execute(
+                text("SELECT copies_available, copies_total FROM book WHERE id = :id"),
+                {"id": book_id},
+            ).one()
+            if not 0 <= available <= total:
+                out_of_range.append(available)
+
+
+def send(calls, headers, barrier, approved, errors):
+    client = app.test_client()
+    barrier.wait()
+    for method, path, body in calls:
+        response = client.open(path, method=method, json=body, headers=headers)
+        if response.status_code >= 500:
+            errors.append(f"{method} {path}: {response.status_code}")
+        elif body is None and response.status_code == 200:
+            approved.append(int(path.rsplit("/", 1)[1]))
+        elif body is not None and response.status_code == 200:
+            approved.extend(response.get_json()["approved"])
+        elif response.status_code != 409:
+            errors.append(f"{method} {path}: {response.status_code}")
+
+
+def run_round(mode, headers, user, args, rng, tag):
+    copies = args.copies or rng.randint(1, args.requests)
+    with app.app_context():
+        book_id, borrow_ids = create_round(tag, user, copies, args.requests)
+        engine = db.engine
+    calls = plan_requests(mode, borrow_ids, rng)
+
+    approved, errors, out_of_range = [], [], []
+    stop = Event()
+    watcher = Thread(target=watch_copies, args=(engine, book_id, stop, out_of_range))
+    barrier = Barrier(args.threads)
+    clients = [
+        Thread(
+            target=send,
+            args=(calls[n :: args.threads], headers, barrier, approved, errors),
+        )
+        for n in range(args.threads)
+    ]
+    start = time.perf_counter()
+    with app.app_context():
+        watcher.start()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        stop.set()
+        watcher.join()
+        elapsed = time.perf_counter() - start
+
+        stored = set(
+            db.session.scalars(
+                select(Borrow.id).where(
+                    Borrow.book_id == book_id, Borrow.status == "approved"
+                )
+            )
+        )
+        available = db.session.scalar(
+            select(Book.copies_available).where(Book.id == book_id)
+        )
+
+    expected = min(copies, args.requests)
+    failures = errors[:5]
+    if len(approved) != expected:
+        failures.append(f"{len(approved)} approvals answered, expected {expected}")
+    if len(set(approved)) != len(approved):
+        failures.append("a borrow was approved twice")
+    if stored != set(approved):
+        failures.append(f"{len(stored)} borrows approved in the database")
+    if available != copies - len(stored):
+        failures.append(f"copies_available is {available}")
+    if out_of_range:
+        failures.append(f"copies_available went to {min(out_of_range)}")
+    return copies, len(calls), elapsed, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=10, help="per mode")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--copies", type=int, help="default: random per round")
+    parser.add_argument("--requests", type=int, default=50, help="per round")
+    parser.add_argument("--mode", choices=MODES, action="append")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    # views over their query budget fail, as in debug mode
+    app.testing = True
+    rng = random.Random(args.seed)
+    tag = f"{int(time.time())}-{os.getpid()}"
+    with app.app_context():
+        headers, user = create_admin(tag)
+
+    failed = 0
+    for mode in args.mode or MODES:
+        for n in range(args.rounds):
+            copies, calls, elapsed, failures = run_round(
+                mode, headers, user, args, rng, tag
+            )
+            status = "ok" if not failures else "FAILED"
+            print(
+                f"{mode:6} round {n + 1:>3}: {calls} requests for {copies} copies "
+                f"in {elapsed:.2f}s {status}"
+            )
+            for failure in failures:
+                print(f"    {failure}")
+            failed += bool(failures)
+    if failed:
+        sys.exit(f"{failed} rounds failed")
+
+
+if __name__ == "__main__":
+    main()
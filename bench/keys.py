@@ -0,0 +1,163 @@
+from sqlalchemy import text
+import argparse
+import json
+import os
+import sys
+import time
+
+# Storage and join speed of the primary and foreign keys: table and index sizes,
+# and how many times per second the joins along the keys run, on a database
+# seeded by bench/seed.py (same DATABASE_URL). Run it on both sides of a key
+# change. seed.py --reset migrates to head, so step back to the revision before
+# the change first; both runs then measure freshly rewritten tables. For the
+# integer keys of c81d4e2b9f36:
+#
+#   python bench/seed.py --scale 100k --reset
+#   flask --app app db downgrade 6f7ab55c7d1b
+#   python bench/keys.py --save before.json
+#   flask --app app db upgrade
+#   python bench/keys.py --compare before.json
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import app, db
+
+TABLES = [
+    "book",
+    "author",
+    "genre",
+    "user",
+    "borrow",
+    "book_author_table",
+    "book_genre_table",
+    "catalog_change",
+]
+# every join follows foreign keys; the "page" ones look up SAMPLE random books
+# through the primary key, the others join whole tables
+JOINS = {
+    "book-author": (
+        "SELECT count(*) FROM book b "
+        "JOIN book_author_table ba ON ba.book_id = b.id "
+        "JOIN author a ON a.id = ba.author_id"
+    ),
+    "book-genre": (
+        "SELECT count(*) FROM book b "
+        "JOIN book_genre_table bg ON bg.book_id = b.id "
+        "JOIN genre g ON g.id = bg.genre_id"
+    ),
+    "borrow-book-user": (
+        "SELECT count(*) FROM borrow br "
+        "JOIN book b ON b.id = br.book_id "
+        'JOIN "user" u ON u.id = br.user_id'
+    ),
+    "book page": (
+        "SELECT b.id, a.name, g.name FROM book b "
+        "JOIN book_author_table ba ON ba.book_id = b.id "
+        "JOIN author a ON a.id = ba.author_id "
+        "JOIN book_genre_table bg ON bg.book_id = b.id "
+        "JOIN genre g ON g.id = bg.genre_id "
+        "WHERE b.id = ANY(:ids)"
+    ),
+    "borrows of books": (
+        "SELECT br.id, b.title FROM borrow br JOIN book b ON b.id = br.book_id "
+        "WHERE br.book_id = ANY(:ids)"
+    ),
+}
+SAMPLE = 200
+
+
+def sizes(conn):
+    result = {}
+    for table in TABLES:
+        row = conn.execute(
+            text(
+                "SELECT pg_table_size(:t), pg_indexes_size(:t), "
+                "(SELECT count(*) FROM pg_index WHERE indrelid = CAST(:t AS regclass))"
+            ),
+            {"t": f'"{table}"'},
+        ).one()
+        result[table] = {
+            "table_kb": row[0] // 1024,
+            "indexes_kb": row[1] // 1024,
+            "indexes": row[2],
+        }
+    return result
+
+
+# runs of each join per second: the best of `rounds` rounds of `seconds` each,
+# so a busy moment on the machine does not count against either side
+def joins(conn, seconds, rounds):
+    ids = conn.execute(
+        text("SELECT id FROM book ORDER BY random() LIMIT :n"), {"n": SAMPLE}
+    ).scalars()
+    params = {"ids": list(ids)}
+    result = {}
+    for name, sql in JOINS.items():
+        statement = text(sql)
+        conn.execute(statement, params).all()  # warm the cache
+        best = 0
+        for _ in range(rounds):
+            runs = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                conn.execute(statement, params).all()
+                runs += 1
+            best = max(best, runs / (time.perf_counter() - start))
+        result[name] = {
+            "runs_per_second": round(best, 1),
+            "ms": round(1000 / best, 3),
+        }
+    return result
+
+
+def compare(result, baseline):
+    print(f"{'':20} {'table kB':>21} {'indexes kB':>21}")
+    for table, now in result["sizes"].items():
+        before = baseline["sizes"].get(table)
+        if before:
+            print(
+                f"{table:20} {before['table_kb']:>9} -> {now['table_kb']:>9} "
+                f"{before['indexes_kb']:>9} -> {now['indexes_kb']:>9}"
+            )
+    print(f"{'':20} {'runs/second':>21}")
+    for name, now in result["joins"].items():
+        before = baseline["joins"].get(name)
+        if before:
+            change = now["runs_per_second"] / before["runs_per_second"] - 1
+            print(
+                f"{name:20} {before['runs_per_second']:>9} -> "
+                f"{now['runs_per_second']:>9} {change:+.0%}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=1, help="per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="earlier results to compare against")
+    args = parser.parse_args()
+
+    with app.app_context(), db.engine.connect() as conn:
+        # sizes after a rewrite (ALTER COLUMN TYPE) and after a seed compare
+        # only once both have been vacuumed
+        conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql(
+            "VACUUM ANALYZE"
+        )
+        # parallel workers start up at every run and add more noise than the
+        # keys make a difference; one process measures the per-row join cost
+        conn.exec_driver_sql("SET max_parallel_workers_per_gather = 0")
+        result = {"sizes": sizes(conn), "joins": joins(conn, args.seconds, args.rounds)}
+
+    print(json.dumps(result, indent=2))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
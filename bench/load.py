@@ -0,0 +1,305 @@
+from collections import defaultdict
+from statistics import mean, quantiles
+from threading import Thread, local
+import argparse
+import base64
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# Mixed-workload benchmark, run in-process through the Flask test client against
+# a database freshly seeded by bench/seed.py (same DATABASE_URL); the run writes
+# to the catalog, so reseed before every run to keep runs comparable:
+#
+#   python bench/seed.py --scale 10k --reset
+#   python bench/load.py --requests 3000 --save bench/baseline.json
+#   python bench/seed.py --scale 10k --reset
+#   python bench/load.py --requests 3000 --compare bench/baseline.json
+#
+# Reports throughput, p50/p95/p99 latency and SQL statements per request for
+# every request kind. --compare exits with status 1 when a request kind got
+# slower than --tolerance at p95 or issues more statements than the baseline.
+# The app runs in testing mode, so a view over its @query_budget fails the run.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+
+from app import Book, User, app, db, read_book_records
+from seed import ADMIN, MEMBER_PASSWORD, read_users
+
+# scenario: weight
+MIX = {
+    "list_books": 25,
+    "search_title": 10,
+    "search_text": 10,
+    "book_details": 25,
+    "borrow_request": 10,
+    "borrow_approve": 6,
+    "borrow_return": 6,
+    "add_book": 3,
+    "update_book": 5,
+}
+
+# SQL statements issued by the current thread
+statements = local()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def count_statement(conn, cursor, statement, parameters, context, executemany):
+    statements.count = getattr(statements, "count", 0) + 1
+
+
+def basic_auth(email, password):
+    token = base64.b64encode(f"{email}:{password}".encode()).decode()
+    return {"Authorization": f"Basic {token}"}
+
+
+ADMIN_AUTH = basic_auth(ADMIN["email"], ADMIN["password"])
+
+
+class Runner:
+    def __init__(self, catalog, seed):
+        self.client = app.test_client()
+        self.catalog = catalog
+        self.rng = random.Random(seed)
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.over_budget = []
+
+    # one measured request; `expect` lists the statuses that are not errors
+    def call(self, name, method, path, expect=(200,), **kwargs):
+        statements.count = 0
+        start = time.perf_counter()
+        try:
+            response = self.client.open(path, method=method, **kwargs)
+        except AssertionError as error:
+            # raised by @query_budget in testing mode
+            self.over_budget.append(f"{method} {path}: {error}")
+            raise
+        self.latencies[name].append(time.perf_counter() - start)
+        self.queries[name] += statements.count
+        if response.status_code not in expect:
+            self.errors[name] += 1
+        return response
+
+    def book_id(self):
+        return self.rng.choice(self.catalog["books"])
+
+    def member(self):
+        return basic_auth(*self.rng.choice(self.catalog["members"]))
+
+    def list_books(self):
+        after = self.rng.choice(self.catalog["books"])
+        self.call("list_books", "GET", f"/books?after={after}&limit=50")
+
+    def search_title(self):
+        word = self.rng.choice(self.catalog["words"])
+        self.call("search_title", "GET", f"/booksearch?title={word[:4]}")
+
+    def search_text(self):
+        words = self.rng.sample(self.catalog["words"], 2)
+        self.call("search_text", "GET", f"/booksearch?q={'+'.join(words)}")
+
+    def book_details(self):
+        self.call("book_details", "GET", f"/book/{self.book_id()}")
+
+    def borrow_request(self):
+        self.call(
+            "borrow_request",
+            "POST",
+            f"/borrow/{self.book_id()}",
+            expect=(201,),
+            headers=self.member(),
+        )
+
+    # an admin works the oldest pending requests, then the oldest loans
+    def borrow_approve(self):
+        queue = self.call(
+            "borrow_queue",
+            "GET",
+            "/borrows?status=requested&limit=10",
+            headers=ADMIN_AUTH,
+        )
+        ids = [b["id"] for b in queue.get_json()["results"]]
+        if ids:
+            self.call(
+                "borrow_approve",
+                "PUT",
+                "/borrow/approve",
+                json={"ids": ids},
+                headers=ADMIN_AUTH,
+            )
+
+    def borrow_return(self):
+        queue = self.call(
+            "borrow_queue",
+            "GET",
+            "/borrows?status=approved&limit=10",
+            headers=ADMIN_AUTH,
+        )
+        ids = [b["id"] for b in queue.get_json()["results"]]
+        if ids:
+            self.call(
+                "borrow_return",
+                "PUT",
+                f"/borrow/return/{self.rng.choice(ids)}",
+                expect=(200, 409),
+                headers=ADMIN_AUTH,
+            )
+
+    def add_book(self):
+        record = dict(self.rng.choice(self.catalog["records"]))
+        record["title"] = f"{record['title']} (bench {self.rng.random():.12f})"
+        self.call(
+            "add_book", "POST", "/book", expect=(201,), json=record, headers=ADMIN_AUTH
+        )
+
+    def update_book(self):
+        self.call(
+            "update_book",
+            "PUT",
+            f"/book/{self.book_id()}",
+            json={"pages": self.rng.randrange(50, 500)},
+            headers=ADMIN_AUTH,
+        )
+
+    def run(self, requests):
+        names = list(MIX)
+        weights = list(MIX.values())
+        for name in self.rng.choices(names, weights, k=requests):
+            getattr(self, name)()
+
+
+def load_catalog():
+    with app.app_context():
+        books = db.session.scalars(select(Book.id).where(Book.is_show == True)).all()
+        members = db.session.scalars(
+            select(User.email).where(User.type == "member").order_by(User.id).limit(500)
+        ).all()
+    if not books:
+        sys.exit("no books; seed the database with bench/seed.py first")
+    passwords = {u["email"]: u["password"] for u in read_users()}
+    records = list(read_book_records(os.path.join(ROOT, "booklist.py")))
+    words = sorted(
+        {w.strip(":,.").lower() for r in records for w in r["title"].split()} - {""}
+    )
+    return {
+        "books": sorted(books),
+        "members": [
+            (email, passwords.get(email, MEMBER_PASSWORD)) for email in members
+        ],
+        "records": records,
+        "words": [w for w in words if len(w) >= 4],
+    }
+
+
+def summarize(runners, elapsed, catalog, args):
+    latencies = defaultdict(list)
+    queries = defaultdict(int)
+    errors = defaultdict(int)
+    for runner in runners:
+        for name, values in runner.latencies.items():
+            latencies[name] += values
+            queries[name] += runner.queries[name]
+            errors[name] += runner.errors[name]
+
+    def stats(values, statements, failed):
+        cuts = quantiles(values, n=100) if len(values) > 1 else values * 99
+        return {
+            "count": len(values),
+            "errors": failed,
+            "mean_ms": round(mean(values) * 1000, 3),
+            "p50_ms": round(cuts[49] * 1000, 3),
+            "p95_ms": round(cuts[94] * 1000, 3),
+            "p99_ms": round(cuts[98] * 1000, 3),
+            "queries_per_request": round(statements / len(values), 2),
+        }
+
+    every = [v for values in latencies.values() for v in values]
+    total = stats(every, sum(queries.values()), sum(errors.values()))
+    total["requests_per_second"] = round(len(every) / elapsed, 1)
+    return {
+        "meta": {
+            "books": len(catalog["books"]),
+            "requests": args.requests,
+            "threads": args.threads,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "total": total,
+        "scenarios": {
+            name: stats(latencies[name], queries[name], errors[name])
+            for name in sorted(latencies)
+        },
+    }
+
+
+# prints the change of every request kind and returns the regressions
+def compare(result, baseline, tolerance):
+    regressions = []
+    print(f"{'':16} {'p95 ms':>21} {'queries/request':>21}")
+    for name, now in result["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            print(f"{name:16} {now['p95_ms']:>21} {now['queries_per_request']:>21}")
+            continue
+        change = now["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0
+        print(
+            f"{name:16} {before['p95_ms']:>8} -> {now['p95_ms']:>8} {change:+.0%} "
+            f"{before['queries_per_request']:>8} -> {now['queries_per_request']:>8}"
+        )
+        if change > tolerance:
+            regressions.append(f"{name}: p95 {change:+.0%}")
+        if now["queries_per_request"] > before["queries_per_request"] + 0.1:
+            regressions.append(f"{name}: more queries per request")
+    before = baseline["total"]["requests_per_second"]
+    now = result["total"]["requests_per_second"]
+    print(f"throughput: {before} -> {now} req/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    app.testing = True
+    catalog = load_catalog()
+    runners = [Runner(catalog, args.seed + i) for i in range(args.threads)]
+    share = args.requests // args.threads
+    threads = [Thread(target=runner.run, args=(share,)) for runner in runners]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result = summarize(runners, time.perf_counter() - start, catalog, args)
+
+    print(json.dumps(result, indent=2))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+    over_budget = [line for runner in runners for line in runner.over_budget]
+    if over_budget:
+        sys.exit("over the query budget:\n  " + "\n  ".join(over_budget))
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit("regressions:\n  " + "\n  ".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
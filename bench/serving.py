@@ -0,0 +1,164 @@
+from statistics import quantiles
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+# Compare requests/sec of the sync Werkzeug/psycopg2 path (app.py) with the
+# ASGI/asyncpg entry point (asgi.py) on the same catalog routes.
+#
+#   python bench/serving.py --concurrency 64 --duration 10
+#
+# Both servers are started locally against the database configured in .env, or
+# DATABASE_URL; the catalog should already be loaded (bench/seed.py, or flask
+# import-books booklist.py). Requests go to random pages and records of it, and
+# the response cache is off unless --cache is given, so both servers query the
+# database (psycopg2 and asyncpg) instead of answering from the cache.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import select
+
+from app import Author, Book, Genre, app, db
+
+SERVERS = {
+    "sync": ["flask", "--app", "app", "run", "--port", "{port}"],
+    "asgi": [
+        "uvicorn",
+        "asgi:application",
+        "--port",
+        "{port}",
+        "--log-level",
+        "warning",
+    ],
+}
+# path templates, filled with a random id of the model
+PATHS = [
+    ("/books?after={}&limit=50", Book),
+    ("/book/{}", Book),
+    ("/genres?after={}", Genre),
+    ("/genre/{}", Genre),
+    ("/authors?after={}&limit=20", Author),
+    ("/author/{}", Author),
+]
+
+
+# visible ids of every model the paths use
+def load_ids():
+    with app.app_context():
+        return {
+            model: db.session.scalars(
+                select(model.id).where(model.is_show == True)
+            ).all()
+            for model in {model for _, model in PATHS}
+        }
+
+
+def random_path(ids, rng):
+    template, model = rng.choice(PATHS)
+    return template.format(rng.choice(ids[model]))
+
+
+async def fetch(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode()
+    )
+    data = await reader.read()
+    writer.close()
+    return int(data.split(b" ", 2)[1])
+
+
+async def client(port, deadline, paths, latencies, errors):
+    while time.perf_counter() < deadline:
+        path = next(paths)
+        start = time.perf_counter()
+        try:
+            status = await fetch(port, path)
+        except OSError:
+            status = None
+        if status == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(status)
+
+
+async def load(port, concurrency, duration, paths):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *[client(port, deadline, paths, latencies, errors) for _ in range(concurrency)]
+    )
+    cuts = quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+    }
+
+
+def wait_for(port, timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            asyncio.run(fetch(port, "/"))
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--cache", action="store_true", help="keep the response cache on"
+    )
+    args = parser.parse_args()
+
+    ids = load_ids()
+    env = dict(os.environ)
+    if not args.cache:
+        # every entry of a zero-size local cache is evicted as soon as it is set
+        env.pop("RESPONSE_CACHE_URL", None)
+        env["RESPONSE_CACHE_SIZE"] = "0"
+
+    results = {}
+    for i, (name, command) in enumerate(SERVERS.items()):
+        port = args.port + i
+        command = [part.format(port=port) for part in command]
+        server = subprocess.Popen(
+            command,
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        # the same request sequence for both servers
+        rng = random.Random(args.seed)
+        paths = iter(lambda: random_path(ids, rng), None)
+        try:
+            wait_for(port)
+            asyncio.run(load(port, 4, 1, paths))  # warm up the pools
+            results[name] = asyncio.run(
+                load(port, args.concurrency, args.duration, paths)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        print(name, results[name], file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
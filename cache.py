@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from threading import Lock
+import hashlib
+import time
+
+
+# Process-local LRU cache whose entries also expire after `ttl` seconds
+class TTLCache:
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            # mark as most recently used
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            # evict the least recently used entries
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    # drop every entry whose value matches the predicate
+    def discard_if(self, predicate):
+        with self._lock:
+            for key in [k for k, (v, _) in self._data.items() if predicate(v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Response cache backends.
+# Entries are (etag, body) pairs. Invalidation bumps a per-tag generation that
+# is part of every key, so stale entries are never read again and age out.
+class LocalBackend:
+    def __init__(self, maxsize=4096, ttl=300):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = {}
+        self._lock = Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, entry):
+        self._entries.set(key, entry)
+
+    def generation(self, tag):
+        return self._generations.get(tag, 0)
+
+    def bump(self, tag):
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+
+
+# shared between processes through any client with redis-py's get/set/incr
+class RedisBackend:
+    def __init__(self, client, ttl=300, prefix="perpustakaan:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return etag.decode(), body
+
+    def set(self, key, entry):
+        etag, body = entry
+        self.client.set(self.prefix + key, etag.encode() + b"\n" + body, ex=self.ttl)
+
+    def generation(self, tag):
+        return int(self.client.get(self.prefix + "gen:" + tag) or 0)
+
+    def bump(self, tag):
+        self.client.incr(self.prefix + "gen:" + tag)
+
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def key(self, tags, path):
+        generations = ",".join(f"{t}@{self.backend.generation(t)}" for t in tags)
+        return f"{generations}|{path}"
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, body):
+        etag = hashlib.sha1(body).hexdigest()
+        self.backend.set(key, (etag, body))
+        return etag, body
+
+    def invalidate(self, *tags):
+        for tag in set(tags):
+            self.backend.bump(tag)
@@ -0,0 +1,48 @@
+from werkzeug.routing import BaseConverter, ValidationError
+
+# Primary keys are integers handed out by the <table>_id_seq sequences. The
+# "bk001" style codes the keys used to be are derived from them for display,
+# and are still accepted wherever an id is: "bk001", "bk1" and "1" are book 1.
+PREFIXES = {
+    "book": ("bk",),
+    "author": ("au",),
+    # genres created through POST /book used to get the author prefix
+    "genre": ("ge", "au"),
+    "user": ("user",),
+    "borrow": ("brw",),
+    "job": ("job",),
+}
+MAX_ID = 2**31 - 1  # INTEGER columns
+
+
+# "bk001" for book 1
+def code(kind, id):
+    return PREFIXES[kind][0] + str(id).zfill(3)
+
+
+# the integer id of "bk001", "bk1" or "1"; ValueError for anything else
+def parse(value, kind):
+    digits = str(value)
+    for prefix in PREFIXES[kind]:
+        if digits.startswith(prefix):
+            digits = digits[len(prefix) :]
+            break
+    if not (digits.isascii() and digits.isdigit()) or int(digits) > MAX_ID:
+        raise ValueError(f"not a {kind} id: {value!r}")
+    return int(digits)
+
+
+# URL converter for ids or codes of one kind: "/book/<id(book):id>"
+class IdConverter(BaseConverter):
+    def __init__(self, map, kind):
+        super().__init__(map)
+        self.kind = kind
+
+    def to_python(self, value):
+        try:
+            return parse(value, self.kind)
+        except ValueError:
+            raise ValidationError()
+
+    def to_url(self, value):
+        return str(value)
@@ -0,0 +1,51 @@
+"""make genre names unique
+
+Revision ID: 26a6f99882ed
+Revises: c81d4e2b9f36
+Create Date: 2026-10-17 13:48:33.401826
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '26a6f99882ed'
+down_revision = 'c81d4e2b9f36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # POST /book could create a second genre with a name already taken; the
+    # books of every duplicate move to the oldest genre of that name, the one
+    # the bulk import already resolved the name to
+    op.execute("""
+        INSERT INTO book_genre_table (book_id, genre_id)
+        SELECT bg.book_id, keep.id
+        FROM book_genre_table bg
+        JOIN genre dup ON dup.id = bg.genre_id
+        JOIN genre keep ON keep.name = dup.name AND keep.id < dup.id
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute("""
+        DELETE FROM book_genre_table bg
+        USING genre dup, genre keep
+        WHERE dup.id = bg.genre_id AND keep.name = dup.name AND keep.id < dup.id
+    """)
+    op.execute("""
+        DELETE FROM genre dup
+        USING genre keep
+        WHERE keep.name = dup.name AND keep.id < dup.id
+    """)
+    # resolve_names() in app.py inserts with ON CONFLICT (name)
+    with op.batch_alter_table('genre', schema=None) as batch_op:
+        batch_op.drop_index('ix_genre_name')
+        batch_op.create_unique_constraint('genre_name_key', ['name'])
+
+
+def downgrade():
+    # merged duplicates are not split again
+    with op.batch_alter_table('genre', schema=None) as batch_op:
+        batch_op.drop_constraint('genre_name_key', type_='unique')
+        batch_op.create_index('ix_genre_name', ['name'], unique=False)
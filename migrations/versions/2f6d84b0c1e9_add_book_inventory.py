@@ -0,0 +1,41 @@
+"""add book inventory counts
+
+Revision ID: 2f6d84b0c1e9
+Revises: e5a3c7d19b02
+Create Date: 2026-10-17 14:25:12.870433
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f6d84b0c1e9'
+down_revision = 'e5a3c7d19b02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('book', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('copies_total', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('copies_available', sa.Integer(), server_default='1', nullable=False))
+
+    # copies already out on approved borrows are not available; counted in one
+    # pass over borrow, which has no index on book_id yet at this revision
+    op.execute(
+        "UPDATE book SET copies_available = GREATEST(book.copies_total - lent.n, 0) "
+        "FROM (SELECT book_id, count(*) AS n FROM borrow "
+        "WHERE status = 'approved' GROUP BY book_id) AS lent "
+        "WHERE lent.book_id = book.id"
+    )
+
+    with op.batch_alter_table('book', schema=None) as batch_op:
+        batch_op.create_check_constraint('ck_book_copies', 'copies_available >= 0 AND copies_available <= copies_total')
+
+
+def downgrade():
+    with op.batch_alter_table('book', schema=None) as batch_op:
+        batch_op.drop_constraint('ck_book_copies', type_='check')
+        batch_op.drop_column('copies_available')
+        batch_op.drop_column('copies_total')
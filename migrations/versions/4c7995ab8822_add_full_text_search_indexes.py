@@ -0,0 +1,35 @@
+"""add full text search indexes
+
+Revision ID: 4c7995ab8822
+Revises: 684417b6543b
+Create Date: 2026-10-17 13:20:41.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4c7995ab8822'
+down_revision = '684417b6543b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('book', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('simple', coalesce(title, '')), 'A') || setweight(to_tsvector('simple', coalesce(publisher, '')), 'C')", persisted=True), nullable=True))
+        batch_op.create_index('ix_book_search_vector', ['search_vector'], unique=False, postgresql_using='gin')
+
+    with op.batch_alter_table('author', schema=None) as batch_op:
+        batch_op.create_index('ix_author_name_tsv', [sa.text("to_tsvector('simple', name)")], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    with op.batch_alter_table('author', schema=None) as batch_op:
+        batch_op.drop_index('ix_author_name_tsv', postgresql_using='gin')
+
+    with op.batch_alter_table('book', schema=None) as batch_op:
+        batch_op.drop_index('ix_book_search_vector', postgresql_using='gin')
+        batch_op.drop_column('search_vector')
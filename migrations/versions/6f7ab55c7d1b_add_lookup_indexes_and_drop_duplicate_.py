@@ -0,0 +1,73 @@
+"""add lookup indexes and drop duplicate id indexes
+
+Revision ID: 6f7ab55c7d1b
+Revises: a3f81c6e5d27
+Create Date: 2026-10-17 13:28:37.032600
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f7ab55c7d1b'
+down_revision = 'a3f81c6e5d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ix_<table>_id duplicated the primary key index of every table
+    with op.batch_alter_table('author', schema=None) as batch_op:
+        batch_op.drop_index('ix_author_id')
+
+    with op.batch_alter_table('book', schema=None) as batch_op:
+        batch_op.drop_index('ix_book_id')
+        batch_op.create_index('ix_book_id_visible', ['id'], unique=False, postgresql_where=sa.text('is_show'))
+
+    with op.batch_alter_table('book_author_table', schema=None) as batch_op:
+        batch_op.create_index('ix_book_author_table_author_id', ['author_id', 'book_id'], unique=False)
+
+    with op.batch_alter_table('book_genre_table', schema=None) as batch_op:
+        batch_op.create_index('ix_book_genre_table_genre_id', ['genre_id', 'book_id'], unique=False)
+
+    with op.batch_alter_table('borrow', schema=None) as batch_op:
+        batch_op.drop_index('ix_borrow_id')
+        batch_op.create_index(batch_op.f('ix_borrow_book_id'), ['book_id'], unique=False)
+        batch_op.create_index('ix_borrow_id_visible', ['id'], unique=False, postgresql_where=sa.text('is_show'))
+
+    with op.batch_alter_table('genre', schema=None) as batch_op:
+        batch_op.drop_index('ix_genre_id')
+        batch_op.create_index(batch_op.f('ix_genre_name'), ['name'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_id')
+        batch_op.create_index('ix_user_email_lower', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_email_lower')
+        batch_op.create_index('ix_user_id', ['id'], unique=True)
+
+    with op.batch_alter_table('genre', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_genre_name'))
+        batch_op.create_index('ix_genre_id', ['id'], unique=True)
+
+    with op.batch_alter_table('borrow', schema=None) as batch_op:
+        batch_op.drop_index('ix_borrow_id_visible', postgresql_where=sa.text('is_show'))
+        batch_op.drop_index(batch_op.f('ix_borrow_book_id'))
+        batch_op.create_index('ix_borrow_id', ['id'], unique=True)
+
+    with op.batch_alter_table('book_genre_table', schema=None) as batch_op:
+        batch_op.drop_index('ix_book_genre_table_genre_id')
+
+    with op.batch_alter_table('book_author_table', schema=None) as batch_op:
+        batch_op.drop_index('ix_book_author_table_author_id')
+
+    with op.batch_alter_table('book', schema=None) as batch_op:
+        batch_op.drop_index('ix_book_id_visible', postgresql_where=sa.text('is_show'))
+        batch_op.create_index('ix_book_id', ['id'], unique=True)
+
+    with op.batch_alter_table('author', schema=None) as batch_op:
+        batch_op.create_index('ix_author_id', ['id'], unique=True)
@@ -0,0 +1,28 @@
+"""add borrow status queue indexes
+
+Revision ID: 7d2c95e4a8f1
+Revises: 2f6d84b0c1e9
+Create Date: 2026-10-17 14:48:55.316020
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2c95e4a8f1'
+down_revision = '2f6d84b0c1e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('borrow', schema=None) as batch_op:
+        batch_op.create_index('ix_borrow_status_requested_date', ['status', 'requested_date', 'id'], unique=False, postgresql_where=sa.text('is_show'))
+        batch_op.create_index('ix_borrow_user_id_status', ['user_id', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('borrow', schema=None) as batch_op:
+        batch_op.drop_index('ix_borrow_user_id_status')
+        batch_op.drop_index('ix_borrow_status_requested_date', postgresql_where=sa.text('is_show'))
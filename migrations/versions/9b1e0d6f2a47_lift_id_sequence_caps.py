@@ -0,0 +1,33 @@
+"""lift id sequence caps and allocate ids in blocks
+
+Revision ID: 9b1e0d6f2a47
+Revises: 4c7995ab8822
+Create Date: 2026-10-17 13:41:09.552870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1e0d6f2a47'
+down_revision = '4c7995ab8822'
+branch_labels = None
+depends_on = None
+
+SEQUENCES = ['book_id_seq', 'author_id_seq', 'genre_id_seq', 'user_id_seq', 'borrow_id_seq']
+
+# IdAllocator in app.py reads the block size back from pg_sequences
+BLOCK_SIZE = 100
+
+
+def upgrade():
+    for sequence in SEQUENCES:
+        # sql/sequence.sql used to create these by hand
+        op.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence} AS INT MINVALUE 1 START 1")
+        op.execute(f"ALTER SEQUENCE {sequence} INCREMENT BY {BLOCK_SIZE} NO MAXVALUE NO CYCLE")
+
+
+def downgrade():
+    for sequence in SEQUENCES:
+        op.execute(f"ALTER SEQUENCE {sequence} INCREMENT BY 1 MAXVALUE 999 NO CYCLE")
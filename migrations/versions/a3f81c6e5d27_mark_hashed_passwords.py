@@ -0,0 +1,30 @@
+"""mark hashed passwords
+
+Revision ID: a3f81c6e5d27
+Revises: 7d2c95e4a8f1
+Create Date: 2026-10-17 16:02:37.418265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f81c6e5d27'
+down_revision = '7d2c95e4a8f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # existing rows hold plaintext passwords; login() hashes each one the next
+    # time its user signs in and flips the flag
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('password_hashed', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+
+
+def downgrade():
+    # hashes cannot be turned back into passwords: users who signed in since the
+    # upgrade need a password reset after downgrading
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('password_hashed')
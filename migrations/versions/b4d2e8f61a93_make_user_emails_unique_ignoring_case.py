@@ -0,0 +1,41 @@
+"""make user emails unique ignoring case
+
+Revision ID: b4d2e8f61a93
+Revises: 4c8c03233d95
+Create Date: 2026-10-17 16:12:05.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d2e8f61a93'
+down_revision = '4c8c03233d95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # emails are matched case-insensitively since 6f7ab55c7d1b, so accounts
+    # differing only in case could not all log in; the oldest keeps the email,
+    # the others get "<email>#duplicate-<id>" for an admin to sort out
+    op.execute("""
+        UPDATE "user" dup
+        SET email = dup.email || '#duplicate-' || dup.id
+        FROM "user" keep
+        WHERE lower(keep.email) = lower(dup.email) AND keep.id < dup.id
+    """)
+    # the unique lower(email) index also rules out exact duplicates
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_email_lower')
+        batch_op.create_index('ix_user_email_lower', [sa.text('lower(email)')], unique=True)
+        batch_op.drop_constraint('user_email_key', type_='unique')
+
+
+def downgrade():
+    # renamed duplicates keep their new emails
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_unique_constraint('user_email_key', ['email'])
+        batch_op.drop_index('ix_user_email_lower')
+        batch_op.create_index('ix_user_email_lower', [sa.text('lower(email)')], unique=False)
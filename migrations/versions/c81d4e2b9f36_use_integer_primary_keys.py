@@ -0,0 +1,82 @@
+"""use integer primary keys
+
+Revision ID: c81d4e2b9f36
+Revises: 6f7ab55c7d1b
+Create Date: 2026-10-17 18:12:40.571093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81d4e2b9f36'
+down_revision = '6f7ab55c7d1b'
+branch_labels = None
+depends_on = None
+
+# table -> code prefix of its ids, as in ids.PREFIXES
+PREFIXES = {'book': 'bk', 'author': 'au', 'genre': 'ge', 'user': 'user', 'borrow': 'brw'}
+# table -> {column: referenced table}
+FOREIGN_KEYS = {
+    'book_author_table': {'book_id': 'book', 'author_id': 'author'},
+    'book_genre_table': {'book_id': 'book', 'genre_id': 'genre'},
+    'borrow': {'book_id': 'book', 'user_id': 'user'},
+}
+# table -> id columns to convert, all in one rewrite of the table
+COLUMNS = {
+    'book': ['id'],
+    'author': ['id'],
+    'genre': ['id'],
+    'user': ['id'],
+    'borrow': ['id', 'book_id', 'user_id'],
+    'book_author_table': ['book_id', 'author_id'],
+    'book_genre_table': ['book_id', 'genre_id'],
+    'catalog_change': ['book_id'],
+}
+
+
+def drop_foreign_keys():
+    # a foreign key cannot join columns of different types, which the keys
+    # would be halfway through the conversion
+    for table, columns in FOREIGN_KEYS.items():
+        for column in columns:
+            op.drop_constraint(f'{table}_{column}_fkey', table, type_='foreignkey')
+
+
+def create_foreign_keys():
+    for table, columns in FOREIGN_KEYS.items():
+        for column, referred in columns.items():
+            op.create_foreign_key(f'{table}_{column}_fkey', table, referred, [column], ['id'])
+
+
+def alter_columns(type_, using):
+    for table, columns in COLUMNS.items():
+        changes = ', '.join(f'ALTER COLUMN {c} TYPE {type_} USING {using(table, c)}' for c in columns)
+        op.execute(f'ALTER TABLE "{table}" {changes}')
+
+
+# the table whose ids a column holds: book.id and borrow.book_id are books
+def id_table(table, column):
+    return table if column == 'id' else column[:-len('_id')]
+
+
+def upgrade():
+    drop_foreign_keys()
+    # "bk001" -> 1, the sequence value the code was made from; genre ids minted
+    # with the author prefix keep their number too
+    alter_columns('INTEGER', lambda table, column: f"substring({column} from '[0-9]+$')::integer")
+    create_foreign_keys()
+
+
+def downgrade():
+    drop_foreign_keys()
+    # 1 -> "bk001", 1234 -> "bk1234"
+    alter_columns(
+        'VARCHAR',
+        lambda table, column: (
+            f"'{PREFIXES[id_table(table, column)]}' || "
+            f"lpad({column}::text, greatest(length({column}::text), 3), '0')"
+        ),
+    )
+    create_foreign_keys()
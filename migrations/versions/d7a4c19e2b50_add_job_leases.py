@@ -0,0 +1,35 @@
+"""add job leases
+
+Revision ID: d7a4c19e2b50
+Revises: b4d2e8f61a93
+Create Date: 2026-10-17 16:40:21.093614
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7a4c19e2b50'
+down_revision = 'b4d2e8f61a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+
+    # jobs running now keep the hour they were given before leases
+    op.execute(
+        "UPDATE job SET lease_expires_at = started_at + interval '1 hour', attempts = 1 "
+        "WHERE status = 'running'"
+    )
+    op.execute("UPDATE job SET attempts = 1 WHERE status IN ('done', 'failed')")
+
+
+def downgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_column('attempts')
+        batch_op.drop_column('lease_expires_at')
@@ -0,0 +1,213 @@
+from flask.json.provider import DefaultJSONProvider
+from functools import partial
+import ids
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
+MONTHS += ["Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+# "15 Jun 2023", like strftime("%d %b %Y") in the C locale; None stays None
+def day_month_year(value):
+    if value is None:
+        return None
+    return f"{value.day:02d} {MONTHS[value.month - 1]} {value.year}"
+
+
+# "2023-06-15", or "2023-06-15T10:30:00" for a datetime; None stays None
+def iso_date(value):
+    return value.isoformat() if value is not None else None
+
+
+# field spec deriving the "bk001" style code of an integer id
+def code(kind, attr="id"):
+    return (attr, partial(ids.code, kind))
+
+
+# field spec for the `attr` of every item of a relationship, e.g. author names
+class Names:
+    def __init__(self, relationship, attr="name"):
+        self.relationship = relationship
+        self.attr = attr
+
+
+# Encoder compiled once from a field spec into plain Python expressions, so
+# encoding a row is a single dict literal with no per-field lookups or calls.
+# Spec values: "attr" (dotted paths allowed), ("attr", function),
+# Names("relationship"), or a nested spec dict.
+class Encoder:
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self._env = {}
+        body = self._expr(fields)
+        self.encode = eval(f"lambda obj: {body}", self._env)
+        # the list comprehension is compiled too, saving a call per row
+        self.many = eval(f"lambda objs: [{body} for obj in objs]", self._env)
+
+    def __call__(self, obj):
+        return self.encode(obj)
+
+    def _attr(self, path):
+        if not all(part.isidentifier() for part in path.split(".")):
+            raise ValueError(f"invalid attribute path: {path!r}")
+        return path
+
+    def _expr(self, spec):
+        if isinstance(spec, str):
+            return f"obj.{self._attr(spec)}"
+        if isinstance(spec, Names):
+            relationship = self._attr(spec.relationship)
+            return f"[item.{self._attr(spec.attr)} for item in obj.{relationship}]"
+        if isinstance(spec, tuple):
+            path, function = spec
+            name = f"_f{len(self._env)}"
+            self._env[name] = function
+            return f"{name}(obj.{self._attr(path)})"
+        items = ", ".join(
+            f"{key!r}: {self._expr(value)}" for key, value in spec.items()
+        )
+        return "{" + items + "}"
+
+
+book_summary = Encoder({"title": "title", "id": "id", "code": code("book")})
+book_details = Encoder(
+    {
+        "title": "title",
+        "num_of_page": "pages",
+        "published_year": "published_year",
+        "publisher": "publisher",
+        "genres": Names("genres"),
+        "authors": Names("authors"),
+        "copies": {"total": "copies_total", "available": "copies_available"},
+    }
+)
+search_result = Encoder(
+    {
+        "book_id": "id",
+        "code": code("book"),
+        "title": "title",
+        "publisher": "publisher",
+        "authors": Names("authors"),
+        "published_year": "published_year",
+        "genres": Names("genres"),
+    }
+)
+genre_summary = Encoder({"genre": "name", "id": "id", "code": code("genre")})
+author_summary = Encoder({"name": "name", "id": "id", "code": code("author")})
+user_summary = Encoder(
+    {"name": "name", "type": "type", "id": "id", "code": code("user")}
+)
+borrow_summary = Encoder(
+    {
+        "id": "id",
+        "code": code("borrow"),
+        "title": "book_title",
+        "member": "member_name",
+        "status": "status",
+    }
+)
+borrow_details = Encoder(
+    {
+        "id": "id",
+        "code": code("borrow"),
+        "title": "book_title",
+        "member": "member_name",
+        "status": "status",
+        "admins": {"approved_by": "approve_admin", "returned_by": "return_admin"},
+        "date": {
+            "approved_at": ("approved_date", day_month_year),
+            "requested_at": ("requested_date", day_month_year),
+            "returned_at": ("returned_date", day_month_year),
+        },
+    }
+)
+job_summary = Encoder(
+    {"id": "id", "code": code("job"), "kind": "kind", "status": "status"}
+)
+job_details = Encoder(
+    {
+        "id": "id",
+        "code": code("job"),
+        "kind": "kind",
+        "status": "status",
+        "attempts": "attempts",
+        "result": "result",
+        "error": "error",
+        "date": {
+            "created_at": ("created_at", iso_date),
+            "started_at": ("started_at", iso_date),
+            "finished_at": ("finished_at", iso_date),
+        },
+    }
+)
+
+# exports, one flat row per record
+book_export = Encoder(
+    {
+        "id": "id",
+        "code": code("book"),
+        "title": "title",
+        "pages": "pages",
+        "publisher": "publisher",
+        "published_year": "published_year",
+        "authors": "authors",
+        "genres": "genres",
+        "copies_total": "copies_total",
+        "copies_available": "copies_available",
+        "is_show": "is_show",
+    }
+)
+borrow_export = Encoder(
+    {
+        "id": "id",
+        "code": code("borrow"),
+        "book_id": "book_id",
+        "user_id": "user_id",
+        "book_title": "book_title",
+        "member_name": "member_name",
+        "status": "status",
+        "approve_admin": "approve_admin",
+        "return_admin": "return_admin",
+        "requested_date": ("requested_date", iso_date),
+        "approved_date": ("approved_date", iso_date),
+        "returned_date": ("returned_date", iso_date),
+        "is_show": "is_show",
+    }
+)
+user_export = Encoder(
+    {
+        "id": "id",
+        "code": code("user"),
+        "name": "name",
+        "email": "email",
+        "type": "type",
+        "is_show": "is_show",
+    }
+)
+
+
+# Flask JSON provider backed by orjson, pinned in requirements.txt. Output
+# matches the default provider: sorted keys, compact unless debugging, and dates
+# and other types Flask knows are converted by its own default().
+class ORJSONProvider(DefaultJSONProvider):
+    available = orjson is not None
+
+    def _option(self, pretty=False):
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        return option | orjson.OPT_INDENT_2 if pretty else option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._option()).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is None and self._app.debug or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._option(pretty))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
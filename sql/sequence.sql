@@ -1,18 +1,19 @@
 -- SEQUENCES
-CREATE SEQUENCE book_id_seq AS INT MINVALUE 1 MAXVALUE 999 START 1 NO CYCLE;
+-- ids are handed out in blocks of 100 by the app (see migration 9b1e0d6f2a47)
+CREATE SEQUENCE book_id_seq AS INT MINVALUE 1 START 1 INCREMENT BY 100 NO CYCLE;
 
-CREATE SEQUENCE author_id_seq AS INT MINVALUE 1 MAXVALUE 999 START 1 NO CYCLE;
+CREATE SEQUENCE author_id_seq AS INT MINVALUE 1 START 1 INCREMENT BY 100 NO CYCLE;
 
-CREATE SEQUENCE genre_id_seq AS INT MINVALUE 1 MAXVALUE 999 START 1 NO CYCLE;
+CREATE SEQUENCE genre_id_seq AS INT MINVALUE 1 START 1 INCREMENT BY 100 NO CYCLE;
 
-CREATE SEQUENCE user_id_seq AS INT MINVALUE 1 MAXVALUE 999 START 1 NO CYCLE;
+CREATE SEQUENCE user_id_seq AS INT MINVALUE 1 START 1 INCREMENT BY 100 NO CYCLE;
 -- -- setval of the currentval = 1
 -- SELECT setval('user_id_seq', 1)
 -- -- setval of the nextval = 1
 -- SELECT setval('user_id_seq', 1, false)
 -- SELECT setval('genre_id_seq', 1, false)
 
-CREATE SEQUENCE borrow_id_seq AS INT MINVALUE 1 MAXVALUE 999 START 1 NO CYCLE;
+CREATE SEQUENCE borrow_id_seq AS INT MINVALUE 1 START 1 INCREMENT BY 100 NO CYCLE;
 
 -- TABLES
 SELECT * FROM public.user
@@ -26,4 +27,4 @@ SET is_show = true
 
 
 -- DELETE FROM public.user
--- WHERE id = 'user003'
\ No newline at end of file
+-- WHERE id = 3
\ No newline at end of file